@@ -4,6 +4,7 @@ import os
 import csv
 import logging
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
@@ -24,6 +25,9 @@ logger = logging.getLogger("analytics.portfolio")
 DEFAULT_PORTFOLIO_FILE = Path("./data/portfolio.csv")
 DEFAULT_CACHE_DIR = Path("./cache/analytics")
 
+# Concurrent market-data lookups per analytics run
+MAX_FETCH_WORKERS = 8
+
 class PortfolioAnalytics:
     """Portfolio analytics engine for financial analysis."""
 
@@ -198,12 +202,18 @@ class PortfolioAnalytics:
             # Create copy of portfolio for analysis
             portfolio = self.portfolio_df.copy()
             
+            # Price and earnings lookups are independent network calls, so
+            # issue them all at once and collect the results in symbol order
+            symbols = portfolio['symbol'].unique()
+            with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as pool:
+                price_futures = {symbol: pool.submit(get_price, symbol) for symbol in symbols}
+                surprise_futures = {symbol: pool.submit(get_earnings_surprise, symbol) for symbol in symbols}
+            
             # Get latest prices
             prices = {}
-            for symbol in portfolio['symbol'].unique():
+            for symbol, future in price_futures.items():
                 try:
-                    price = get_price(symbol)
-                    prices[symbol] = price
+                    prices[symbol] = future.result()
                 except Exception as e:
                     logger.error(f"Error getting price for {symbol}: {e}")
                     prices[symbol] = np.nan
@@ -255,7 +265,7 @@ class PortfolioAnalytics:
             earnings_surprises = []
             for symbol in portfolio['symbol'].unique():
                 try:
-                    surprise = get_earnings_surprise(symbol)
+                    surprise = surprise_futures[symbol].result()
                     # Only include significant surprises (>1% absolute)
                     if abs(surprise) > 1.0:
                         earnings_surprises.append({
@@ -301,6 +311,7 @@ class PortfolioAnalytics:
                     "change_from_previous": asia_tech_change
                 },
                 "earnings_surprises": earnings_surprises,
+                "earnings_beats_count": sum(1 for s in earnings_surprises if s["type"] == "beat"),
                 "positions": positions_data  # Add complete positions data
             }
             
@@ -10,23 +10,29 @@ This Streamlit app provides:
 """
 
 import streamlit as st
+import asyncio
 import os
 import sys
 import logging
+import importlib.util
 import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
 import base64
+import re
+from collections import deque
+from itertools import islice
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
-from agents.language.workflow import process_finance_query
-from agents.voice.speech_processor import transcribe_audio, synthesize_speech, get_voice_processor, record_and_transcribe
-from agents.analytics.portfolio import get_portfolio_value, get_risk_exposure
-from agents.retriever.vector_store import query as vector_query
+from agents.analytics.portfolio import get_portfolio_value
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +41,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger("streamlit_app")
 
+# Voice (Whisper) and language (LangGraph) agents are heavy to import and
+# voice is optional, so both are loaded on first use. Script globals reset on
+# every rerun, so the loaded modules are held as process-wide cached resources.
+@st.cache_resource(show_spinner=False)
+def _voice_agent():
+    """Import the voice agent once per process; None when it is not installed."""
+    try:
+        from agents.voice import speech_processor
+    except ImportError as e:
+        logger.warning("Voice processing unavailable: %s", e)
+        return None
+    return speech_processor
+
+def _load_voice():
+    """Report whether the voice agent is available."""
+    return _voice_agent() is not None
+
+def _voice_installed():
+    """Check the voice dependencies are installed without importing them."""
+    return all(importlib.util.find_spec(name) is not None
+               for name in ("whisper", "speech_recognition"))
+
+@st.cache_resource(show_spinner=False)
+def _edge_tts():
+    """Import edge-tts once per process; None when it is not installed."""
+    try:
+        import edge_tts
+    except ImportError as e:
+        logger.warning("Edge TTS unavailable: %s", e)
+        return None
+    return edge_tts
+
+# Upper bound on one Edge TTS synthesis before the UI gives up on it
+_TTS_TIMEOUT_SECONDS = 15
+
+@st.cache_resource(show_spinner=False)
+def _tts_loop():
+    """Event loop running on a daemon thread, shared by every TTS synthesis."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="tts-loop", daemon=True).start()
+    return loop
+
+@st.cache_resource(show_spinner=False)
+def _load_workflow():
+    """Import the language agent workflow once per process."""
+    from agents.language.workflow import process_finance_query
+    return process_finance_query
+
 # Streamlit page configuration
 st.set_page_config(
     page_title="Finance Assistant",
@@ -43,19 +97,125 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+class _InFlightQueries:
+    """Run finance queries off-thread, sharing calls for identical pending queries."""
+
+    def __init__(self, max_workers: int = 4):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="finance-query")
+
+    def submit(self, query: str) -> Future:
+        """Return the future for `query`, reusing one that is already running."""
+        with self._lock:
+            future = self._pending.get(query)
+            if future is None:
+                future = self._executor.submit(_load_workflow(), query)
+                self._pending[query] = future
+                future.add_done_callback(lambda _, q=query: self._pending.pop(q, None))
+        return future
+
+@st.cache_resource
+def _query_batcher():
+    """Process-wide query runner shared by every session."""
+    return _InFlightQueries()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_portfolio():
+    """Portfolio analytics shared across reruns for up to 30 seconds."""
+    return get_portfolio_value()
+
+# Only the latest entries are ever shown, so older chat history is dropped
+_CHAT_HISTORY_LIMIT = 50
+_CHAT_HISTORY_SHOWN = 5
+
+# Quote escaping and line-break flattening for TTS text, applied in one pass
+_TTS_TRANS = str.maketrans({'"': '\\"', "'": "\\'", '\n': ' ', '\r': ' '})
+
+# Sentence boundaries used to synthesize TTS audio in parallel
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+def _fmt_hms(moment: datetime) -> str:
+    """Format a datetime as HH:MM:SS without going through strftime."""
+    return moment.time().isoformat(timespec='seconds')
+
+# Whole-dollar formatter shared by the welcome message and metric cards
+_fmt_usd = "${:,.0f}".format
+
+# Comprehensive list of financial queries that work well with the system
+_QUICK_QUERIES = (
+    "Select a quick query...",
+    # Portfolio Analysis
+    "What's my portfolio performance today?",
+    "Show me Asia tech exposure breakdown",
+    "What's my total portfolio value?",
+    "Which region has the highest allocation?",
+    "What's my risk exposure analysis?",
+    
+    # Earnings & Market Data
+    "Any earnings surprises today?",
+    "Show me recent earnings beats and misses",
+    "Which stocks beat earnings estimates?",
+    "What are the market trends today?",
+    
+    # Specific Stock Queries
+    "How is TSMC performing today?",
+    "Tell me about Alibaba (BABA) stock",
+    "How are my Indian stocks doing?",
+    "What's the performance of ITC stock?",
+    "Give me TCS stock analysis",
+    "How is Reliance performing?",
+    
+    # Risk & Strategy
+    "What's our risk exposure in Asia tech stocks?",
+    "Should I rebalance my portfolio?",
+    "Which stocks are underperforming?",
+    "What's the best performing stock today?",
+    
+    # Market Brief (Main Use Case)
+    "Give me a morning market brief",
+    "What's happening in Asian markets?",
+    "Summarize today's portfolio performance",
+    "Any important market news for my holdings?"
+)
+
+# Static lines for the sidebar's system info panel
+_SYSTEM_INFO = (
+    "Sprint 3: Voice & UI",
+    "LangGraph + CrewAI",
+    "Whisper STT + TTS",
+    "Female Voice: Edge TTS"
+)
+
+@st.cache_resource(show_spinner=False)
+def _resolve_api_key() -> str:
+    """Resolve the Gemini API key from Streamlit secrets or environment once per process."""
+    try:
+        return st.secrets["GEMINI_API_KEY"]
+    except Exception:
+        return os.getenv("GEMINI_API_KEY", "")
+
 def initialize_session_state():
     """Initialize Streamlit session state variables."""
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
     if 'voice_enabled' not in st.session_state:
         st.session_state.voice_enabled = True
     if 'gemini_api_key' not in st.session_state:
-        st.session_state.gemini_api_key = os.getenv("GEMINI_API_KEY", "")
+        st.session_state.gemini_api_key = _resolve_api_key()
+        # The language agents read the key from the environment only
+        if st.session_state.gemini_api_key:
+            os.environ.setdefault("GEMINI_API_KEY", st.session_state.gemini_api_key)
+    if 'query_nonce' not in st.session_state:
+        st.session_state.query_nonce = 0
+        st.session_state.last_processed_nonce = 0
+        st.session_state.pending_query = None
+    if 'chat_history' not in st.session_state:
+        st.session_state.chat_history = deque(maxlen=_CHAT_HISTORY_LIMIT)
 
+@st.cache_data(ttl=30, show_spinner=False)
 def create_welcome_message():
-    """Generate a welcome message with portfolio insights."""
+    """Generate a welcome message with portfolio insights, cached as long as the portfolio."""
     try:
-        portfolio_data = get_portfolio_value()
+        portfolio_data = _cached_portfolio()
         if "error" not in portfolio_data:
             total_value = portfolio_data.get('total_value', 0)
             asia_tech = portfolio_data.get('asia_tech', {})
@@ -71,7 +231,7 @@ def create_welcome_message():
                 exposure_status = "moderate"
             
             welcome_msg = f"""Welcome to your Finance Assistant! 
-            Your portfolio is worth ${total_value:,.0f} across {holdings_count} positions. 
+            Your portfolio is worth {_fmt_usd(total_value)} across {holdings_count} positions. 
             Your Asia tech exposure is {asia_pct:.1f}%, which is {exposure_status}. 
             I'm ready to help with your financial analysis."""
             
@@ -81,12 +241,44 @@ def create_welcome_message():
     except Exception:
         return "Welcome to your Finance Assistant! I'm ready to help with your financial analysis."
 
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _synthesize(clean_text: str) -> bytes:
+    """Synthesize already-cleaned text into MP3 bytes, cached per utterance."""
+    edge_tts = _edge_tts()
+    
+    async def synthesize(sentence):
+        # Collect the MP3 stream in memory instead of round-tripping via disk
+        communicate = edge_tts.Communicate(sentence, "en-US-AriaNeural")
+        buf = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                buf.extend(chunk["data"])
+        return bytes(buf)
+    
+    async def generate_audio():
+        # Synthesize sentences concurrently; MP3 frames concatenate in order
+        sentences = _SENTENCE_SPLIT.split(clean_text)
+        return b"".join(await asyncio.gather(*(synthesize(s) for s in sentences)))
+    
+    # Generate audio on the shared background loop, giving up on a stalled service
+    future = asyncio.run_coroutine_threadsafe(generate_audio(), _tts_loop())
+    try:
+        audio_data = future.result(timeout=_TTS_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
+    if not audio_data:
+        # Raising keeps failed syntheses out of the cache
+        raise RuntimeError("Edge TTS returned no audio")
+    return audio_data
+
 def play_web_compatible_tts(text: str, element_id: str = "tts_audio"):
     """Play TTS using simple, reliable method."""
+    if _edge_tts() is None:
+        return None
     
     # Clean text
-    clean_text = text.replace('"', '\\"').replace("'", "\\'").replace('\n', ' ').replace('\r', ' ')
-    clean_text = ' '.join(clean_text.split())
+    clean_text = ' '.join(text.translate(_TTS_TRANS).split())
     
     # Limit text length
     if len(clean_text) > 500:
@@ -94,92 +286,62 @@ def play_web_compatible_tts(text: str, element_id: str = "tts_audio"):
     
     # Try Edge TTS first
     try:
-        import tempfile
-        import base64
-        import edge_tts
-        import asyncio
+        audio_data = _synthesize(clean_text)
         
-        async def generate_audio():
-            communicate = edge_tts.Communicate(clean_text, "en-US-AriaNeural")
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-                tmp_path = tmp_file.name
-            await communicate.save(tmp_path)
-            return tmp_path
-        
-        # Generate audio
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        audio_path = loop.run_until_complete(generate_audio())
-        
-        # Read audio file
-        with open(audio_path, 'rb') as f:
-            audio_data = f.read()
-        
-        # Clean up
-        os.unlink(audio_path)
-        
-        logger.info("Edge TTS audio generated successfully")
+        logger.debug("Edge TTS audio generated successfully (%d bytes)", len(audio_data))
         return audio_data
         
     except Exception as e:
-        logger.warning(f"Edge TTS failed: {e}")
+        logger.warning("Edge TTS failed: %s", e)
         return None
 
-def display_welcome_greeting():
-    """Display and play welcome greeting - now manual only."""
+# Hidden autoplaying audio element wrapped around a base64 MP3 payload
+_AUDIO_PREFIX = '<audio autoplay style="display:none;"><source src="data:audio/mp3;base64,'
+_AUDIO_SUFFIX = '" type="audio/mp3"></audio>'
+
+def _autoplay_audio_html(text: str, caption: str = "") -> str:
+    """Synthesize ``text`` into a hidden autoplaying audio element."""
+    audio_data = play_web_compatible_tts(text)
+    if not audio_data:
+        raise RuntimeError("Audio generation failed")
+    
+    # base64 output is pure ASCII, so skip UTF-8 decoding
+    audio_b64 = base64.b64encode(audio_data).decode('ascii')
+    caption_html = f"<div>{caption}</div>" if caption else ""
+    return _AUDIO_PREFIX + audio_b64 + _AUDIO_SUFFIX + caption_html
+
+def display_welcome_greeting(welcome_text: str):
+    """Show the welcome briefing and play it without any media controls."""
+    st.success(f"🎉 {welcome_text}")
     try:
-        welcome_text = create_welcome_message()
-        
-        # Show welcome message
-        st.success(f"🎉 {welcome_text}")
-        
-        # Play welcome audio without showing any media controls
-        try:
-            audio_data = play_web_compatible_tts(welcome_text, "welcome_auto")
-            if audio_data:
-                # Use HTML to create a hidden audio element that autoplays
-                audio_bytes = base64.b64encode(audio_data).decode()
-                audio_html = f"""
-                <audio autoplay style="display:none;">
-                    <source src="data:audio/mp3;base64,{audio_bytes}" type="audio/mp3">
-                </audio>
-                <div>🔊 Playing welcome briefing...</div>
-                """
-                st.components.v1.html(audio_html, height=30)
-            else:
-                st.warning("🔊 Audio generation failed")
-                st.info("💡 **Text version:** " + welcome_text)
-        except Exception as e:
-            logger.warning(f"Welcome TTS failed: {e}")
-            st.warning(f"🔊 Welcome audio error: {e}")
-            st.info("💡 **Text version:** " + welcome_text)
-            
-    except Exception as e:
-        logger.error(f"Welcome greeting error: {e}")
-        st.error(f"Welcome greeting error: {e}")
-        # Fallback welcome message
-        fallback_msg = "Welcome to your Finance Assistant! I'm ready to help with your financial analysis."
-        st.success(f"🎉 {fallback_msg}")
-        try:
-            audio_data = play_web_compatible_tts(fallback_msg, "welcome_fallback")
-            if audio_data:
-                # Use HTML to create a hidden audio element that autoplays
-                audio_bytes = base64.b64encode(audio_data).decode()
-                audio_html = f"""
-                <audio autoplay style="display:none;">
-                    <source src="data:audio/mp3;base64,{audio_bytes}" type="audio/mp3">
-                </audio>
-                """
-                st.components.v1.html(audio_html, height=0)
-        except:
-            pass
+        audio_html = _autoplay_audio_html(welcome_text, "🔊 Playing welcome briefing...")
+        st.components.v1.html(audio_html, height=30)
+    except RuntimeError as e:
+        logger.warning("Welcome TTS failed: %s", e)
+        st.warning("🔊 Audio generation failed")
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _prewarm_welcome_audio(welcome_text: str) -> threading.Thread:
+    """Synthesize the welcome briefing in the background, once per distinct text."""
+    thread = threading.Thread(target=play_web_compatible_tts, args=(welcome_text,),
+                              name="tts-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+@st.fragment
+def display_welcome_briefing():
+    """Welcome briefing button; as a fragment, a click reruns only this panel."""
+    welcome_text = create_welcome_message()
+    prewarm = _prewarm_welcome_audio(welcome_text)
+    if st.button("🔊 Welcome Briefing", type="secondary", help="Portfolio briefing with voice"):
+        # Let an in-flight prewarm finish rather than synthesizing twice
+        prewarm.join(timeout=_TTS_TIMEOUT_SECONDS)
+        display_welcome_greeting(welcome_text)
+
+@st.fragment(run_every=30)
+def display_clock():
+    """Show the time to the minute; refreshes every 30 seconds without a full rerun."""
+    st.info(f"🕐 {datetime.now().time().isoformat(timespec='minutes')}")
 
 def display_header():
     """Display the application header."""
@@ -188,27 +350,7 @@ def display_header():
     st.markdown("**Voice-Enabled Morning Market Brief - Speak Clearly for Best Results**")
     
     # Welcome briefing button directly below title - much closer
-    if st.button("🔊 Welcome Briefing", type="secondary", help="Portfolio briefing with voice"):
-        try:
-            welcome_text = create_welcome_message()
-            st.success(f"🎉 {welcome_text}")
-            
-            # Auto-generate and play audio without showing controls
-            audio_data = play_web_compatible_tts(welcome_text, "welcome_auto")
-            if audio_data:
-                # Use HTML to create a hidden audio element that autoplays
-                audio_bytes = base64.b64encode(audio_data).decode()
-                audio_html = f"""
-                <audio autoplay style="display:none;">
-                    <source src="data:audio/mp3;base64,{audio_bytes}" type="audio/mp3">
-                </audio>
-                <div>🔊 Playing welcome briefing...</div>
-                """
-                st.components.v1.html(audio_html, height=30)
-            else:
-                st.warning("🔊 Audio generation failed")
-        except Exception as e:
-            st.error(f"Welcome briefing error: {e}")
+    display_welcome_briefing()
     
     # Status indicators
     col1, col2, col3 = st.columns(3)
@@ -220,15 +362,14 @@ def display_header():
             st.error("❌ Gemini API Key Required")
     
     with col2:
-        try:
-            get_voice_processor()
-            st.success("✅ Voice Ready")
-        except Exception:
+        # The Whisper model itself is loaded by the voice panel on first use
+        if _voice_installed():
+            st.success("✅ Voice Available")
+        else:
             st.warning("⚠️ Voice Processing Limited")
     
     with col3:
-        # Show time with seconds to indicate it's working
-        st.info(f"🕐 {datetime.now().strftime('%H:%M:%S')}")
+        display_clock()
 
 def display_sidebar():
     """Display the application sidebar."""
@@ -244,7 +385,10 @@ def display_sidebar():
         )
         if api_key != st.session_state.gemini_api_key:
             st.session_state.gemini_api_key = api_key
-            os.environ["GEMINI_API_KEY"] = api_key
+            # Export only real keys for the language agent; clearing the field
+            # is handled by the session check and leaves the environment alone
+            if api_key:
+                os.environ["GEMINI_API_KEY"] = api_key
         
         st.divider()
         
@@ -260,11 +404,11 @@ def display_sidebar():
         # Portfolio quick stats
         st.subheader("📊 Portfolio Overview")
         try:
-            portfolio_data = get_portfolio_value()
+            portfolio_data = _cached_portfolio()
             if "error" not in portfolio_data:
                 st.metric(
                     "Total Value",
-                    f"${portfolio_data.get('total_value', 0):,.0f}"
+                    _fmt_usd(portfolio_data.get('total_value', 0))
                 )
                 asia_tech = portfolio_data.get('asia_tech', {})
                 asia_pct = asia_tech.get('percentage', 0)
@@ -290,13 +434,45 @@ def display_sidebar():
         
         # System info
         st.subheader("ℹ️ System Info")
-        st.text("Sprint 3: Voice & UI")
-        st.text("LangGraph + CrewAI")
-        st.text("Whisper STT + TTS")
-        st.text("Female Voice: Edge TTS")
+        for line in _SYSTEM_INFO:
+            st.text(line)
+
+def _handle_transcribed(transcribed_text, source: str):
+    """Validate a transcription and show the outcome; return the text if usable."""
+    text = (transcribed_text or "").strip()
+    if text.startswith("Error"):
+        st.error(f"❌ {source} failed: {text}")
+        return None
+    if len(text) <= 3 or text == "...":
+        st.warning(f"⚠️ **Poor quality transcription:** {transcribed_text}")
+        st.info("💡 Try speaking louder and clearer, closer to microphone")
+        return None
+    st.success(f"✅ **Transcribed:** {text}")
+    return text
+
+def _run_transcription(transcribe, source: str, spinner_text: str):
+    """Shared record/upload flow: check the API key, transcribe, validate the text."""
+    if not st.session_state.gemini_api_key:
+        st.error("Please provide Gemini API Key in sidebar")
+        return None
+    
+    with st.spinner(spinner_text):
+        try:
+            return _handle_transcribed(transcribe(), source)
+        except Exception as e:
+            st.error(f"❌ {source} error: {e}")
+    return None
 
 def process_voice_input():
     """Handle voice input processing."""
+    if not _load_voice():
+        # Explain the missing voice agent once per session, then stay quiet
+        if not st.session_state.setdefault('_voice_banner', False):
+            st.session_state._voice_banner = True
+            st.subheader("🎤 Voice Input")
+            st.info("🎤 Voice input requires the local voice agent (Whisper) to be installed")
+        return None
+    
     st.subheader("🎤 Voice Input")
     
     tab1, tab2 = st.tabs(["📱 Record", "📁 Upload File"])
@@ -306,23 +482,11 @@ def process_voice_input():
         
         # Simple recording interface
         if st.button("🎤 Start Recording", type="primary", key="mic_button", help="8-second recording"):
-            if not st.session_state.gemini_api_key:
-                st.error("Please provide Gemini API Key in sidebar")
-                return None
-            
-            with st.spinner("🎧 Recording for 8 seconds..."):
-                try:
-                    transcribed_text = record_and_transcribe(timeout=8.0)
-                    
-                    if transcribed_text and not transcribed_text.startswith("Error") and transcribed_text.strip() != "..." and len(transcribed_text.strip()) > 3:
-                        st.success(f"✅ **Transcribed:** {transcribed_text}")
-                        return transcribed_text
-                    else:
-                        st.warning(f"⚠️ **Poor quality transcription:** {transcribed_text}")
-                        st.info("💡 Try speaking louder and clearer, closer to microphone")
-                        
-                except Exception as e:
-                    st.error(f"❌ Recording error: {e}")
+            return _run_transcription(
+                lambda: _voice_agent().record_and_transcribe(timeout=8.0),
+                "Recording",
+                "🎧 Recording for 8 seconds..."
+            )
     
     with tab2:
         st.write("Upload an audio file:")
@@ -334,34 +498,26 @@ def process_voice_input():
         )
         
         if uploaded_file is not None:
-            if not st.session_state.gemini_api_key:
-                st.error("Please provide Gemini API Key in sidebar")
-                return None
-            
-            with st.spinner("🔄 Processing audio..."):
+            def transcribe_upload():
+                # Save uploaded file temporarily
+                with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
+                    tmp_file.write(uploaded_file.getvalue())
+                    tmp_path = tmp_file.name
                 try:
-                    # Save uploaded file temporarily
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-                        tmp_file.write(uploaded_file.getvalue())
-                        tmp_path = tmp_file.name
-                    
-                    # Transcribe
-                    transcribed_text = transcribe_audio(tmp_path)
-                    
+                    return _voice_agent().transcribe_audio(tmp_path)
+                finally:
                     # Clean up
                     os.unlink(tmp_path)
-                    
-                    if transcribed_text and not transcribed_text.startswith("Error"):
-                        st.success(f"📝 Transcribed: *{transcribed_text}*")
-                        return transcribed_text
-                    else:
-                        st.error(f"❌ File processing failed: {transcribed_text}")
-                        
-                except Exception as e:
-                    st.error(f"❌ File processing error: {e}")
+            
+            return _run_transcription(transcribe_upload, "File processing", "🔄 Processing audio...")
     
     return None
 
+def _sync_quick_query():
+    """Copy the chosen quick query into the text area's session state."""
+    if st.session_state.quick_query != _QUICK_QUERIES[0]:  # Not the default "Select..."
+        st.session_state.user_query_text = st.session_state.quick_query
+
 def process_text_input():
     """Handle text input processing."""
     st.subheader("✍️ Text Input")
@@ -369,73 +525,36 @@ def process_text_input():
     # Quick queries dropdown
     st.write("**Quick queries:**")
     
-    # Comprehensive list of financial queries that work well with the system
-    query_options = [
-        "Select a quick query...",
-        # Portfolio Analysis
-        "What's my portfolio performance today?",
-        "Show me Asia tech exposure breakdown",
-        "What's my total portfolio value?",
-        "Which region has the highest allocation?",
-        "What's my risk exposure analysis?",
-        
-        # Earnings & Market Data
-        "Any earnings surprises today?",
-        "Show me recent earnings beats and misses",
-        "Which stocks beat earnings estimates?",
-        "What are the market trends today?",
-        
-        # Specific Stock Queries
-        "How is TSMC performing today?",
-        "Tell me about Alibaba (BABA) stock",
-        "How are my Indian stocks doing?",
-        "What's the performance of ITC stock?",
-        "Give me TCS stock analysis",
-        "How is Reliance performing?",
-        
-        # Risk & Strategy
-        "What's our risk exposure in Asia tech stocks?",
-        "Should I rebalance my portfolio?",
-        "Which stocks are underperforming?",
-        "What's the best performing stock today?",
-        
-        # Market Brief (Main Use Case)
-        "Give me a morning market brief",
-        "What's happening in Asian markets?",
-        "Summarize today's portfolio performance",
-        "Any important market news for my holdings?"
-    ]
-    
-    # Initialize session state for selected query
-    if 'selected_quick_query' not in st.session_state:
-        st.session_state.selected_quick_query = query_options[0]
-    
-    # Dropdown selection
-    selected_option = st.selectbox(
+    # Dropdown selection; picking a query copies it straight into the text area
+    st.selectbox(
         "Choose a pre-built query:",
-        query_options,
+        _QUICK_QUERIES,
         index=0,
+        key="quick_query",
+        on_change=_sync_quick_query,
         help="Select from common financial queries or type your own below"
     )
     
-    # Update session state and text area when selection changes
-    query_text = ""
-    if selected_option != query_options[0]:  # Not the default "Select..."
-        query_text = selected_option
-        st.session_state.selected_quick_query = selected_option
-    
-    # Text input area
-    user_query = st.text_area(
-        "Your question:",
-        value=query_text,
-        height=100,
-        placeholder="Ask about your portfolio, market conditions, earnings, or any financial topic...",
-        help="You can select from the dropdown above or type your own question"
-    )
+    # Text input and submit share a form, so editing the question doesn't rerun the app.
+    # The dropdown stays outside: widgets inside a form cannot have on_change callbacks.
+    with st.form("query_form", clear_on_submit=False, border=False):
+        user_query = st.text_area(
+            "Your question:",
+            key="user_query_text",
+            height=100,
+            placeholder="Ask about your portfolio, market conditions, earnings, or any financial topic...",
+            help="You can select from the dropdown above or type your own question"
+        )
+        submitted = st.form_submit_button("🚀 Submit Query", type="primary")
     
-    # Submit button
-    if st.button("🚀 Submit Query", type="primary", disabled=not user_query.strip()):
-        return user_query.strip()
+    # Submit button: record the query under a fresh nonce so it runs exactly once
+    if submitted and user_query.strip():
+        st.session_state.pending_query = user_query.strip()
+        st.session_state.query_nonce += 1
+    
+    if st.session_state.query_nonce != st.session_state.last_processed_nonce:
+        st.session_state.last_processed_nonce = st.session_state.query_nonce
+        return st.session_state.pending_query
     
     return None
 
@@ -443,9 +562,9 @@ def display_response(query: str, response: str):
     """Display the AI response."""
     st.subheader("🤖 AI Response")
     
-    # Add to chat history
+    # Add to chat history; the deque drops the oldest entry once full
     st.session_state.chat_history.append({
-        "timestamp": datetime.now(),
+        "timestamp": time.time(),
         "query": query,
         "response": response
     })
@@ -461,23 +580,42 @@ def display_chat_history():
         
         # Clear history button
         if st.button("🗑️ Clear History"):
-            st.session_state.chat_history = []
+            st.session_state.chat_history.clear()
             st.rerun()
         
         # Display history in reverse order (newest first)
-        for i, chat in enumerate(reversed(st.session_state.chat_history[-5:])):  # Last 5 only
-            with st.expander(f"🕐 {chat['timestamp'].strftime('%H:%M:%S')} - {chat['query'][:50]}..."):
+        newest_first = islice(reversed(st.session_state.chat_history), _CHAT_HISTORY_SHOWN)
+        for i, chat in enumerate(newest_first):
+            asked_at = _fmt_hms(datetime.fromtimestamp(chat['timestamp']))
+            with st.expander(f"🕐 {asked_at} - {chat['query'][:50]}..."):
                 st.markdown(f"**Q:** {chat['query']}")
                 st.markdown(f"**A:** {chat['response']}")
 
-def display_full_portfolio():
+# Position fields produced by get_portfolio_value(); previous_price is optional
+_POSITION_FIELDS = ('symbol', 'shares', 'price', 'market_value', 'geo_tag', 'previous_price')
+
+@st.cache_data(ttl=30, max_entries=8, show_spinner=False)
+def _positions_frame(positions):
+    """Build the positions table; reruns with unchanged positions hit the cache."""
+    # Create a DataFrame with all positions; fixed columns skip per-record key inference
+    df = pd.DataFrame.from_records(positions, columns=_POSITION_FIELDS)
+    
+    # Calculate performance metrics; values stay numeric and are formatted by st.dataframe
+    if df['previous_price'].notna().any():
+        df['change'] = (df['price'] - df['previous_price']) / df['previous_price'] * 100
+    
+    # Reorder columns for display; labels come from st.dataframe's column_config
+    display_cols = ['symbol', 'shares', 'price', 'market_value', 'geo_tag']
+    if 'change' in df.columns:
+        display_cols.append('change')
+        
+    return df[display_cols]
+
+def display_full_portfolio(portfolio_data):
     """Display detailed portfolio breakdown with all stocks."""
     st.subheader("🧮 Complete Portfolio Breakdown")
     
     try:
-        # Get portfolio data
-        portfolio_data = get_portfolio_value()
-        
         if "error" in portfolio_data:
             st.error(f"Portfolio data unavailable: {portfolio_data['error']}")
             return
@@ -493,36 +631,22 @@ def display_full_portfolio():
             st.warning("No positions found in portfolio")
             return
             
-        # Create a DataFrame with all positions
-        df = pd.DataFrame(positions)
-        
-        # Format currency columns
-        currency_cols = ['price', 'market_value']
-        for col in currency_cols:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: f"${x:,.2f}")
-                
-        # Calculate and add performance metrics if available
-        if 'previous_price' in df.columns:
-            df['change'] = ((df['price'] - df['previous_price']) / df['previous_price'] * 100)
-            df['change'] = df['change'].apply(lambda x: f"{x:+.2f}%" if not pd.isna(x) else "N/A")
-        
-        # Reorder and rename columns for display
-        display_cols = ['symbol', 'shares', 'price', 'market_value', 'geo_tag']
-        if 'change' in df.columns:
-            display_cols.append('change')
-            
-        display_df = df[display_cols].rename(columns={
-            'symbol': 'Symbol',
-            'shares': 'Shares',
-            'price': 'Price',
-            'market_value': 'Value',
-            'geo_tag': 'Region/Sector',
-            'change': 'Change (%)'
-        })
-        
-        # Display full portfolio table
-        st.dataframe(display_df, use_container_width=True)
+        # Build (or reuse) the display table for these positions
+        display_df = _positions_frame(positions)
+        
+        # Display full portfolio table, formatted in the frontend
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            column_config={
+                'symbol': "Symbol",
+                'shares': "Shares",
+                'price': st.column_config.NumberColumn("Price", format="dollar"),
+                'market_value': st.column_config.NumberColumn("Value", format="dollar"),
+                'geo_tag': "Region/Sector",
+                'change': st.column_config.NumberColumn("Change (%)", format="%+.2f%%"),
+            }
+        )
         
         # Summary information
         total_value = portfolio_data.get('total_value', 0)
@@ -531,16 +655,22 @@ def display_full_portfolio():
         
     except Exception as e:
         st.error(f"Error displaying portfolio: {e}")
-        logger.error(f"Portfolio display error: {e}")
+        logger.error("Portfolio display error: %s", e)
+
+# Allocation table columns with their display labels and formats
+_ALLOC_LABELS = {'geo_tag': "Region/Sector", 'market_value': "Market Value", 'percentage': "Allocation %"}
+_ALLOC_FMT = {'market_value': "${:,.0f}", 'percentage': "{:.1f}%"}
 
-def display_analytics_dashboard():
+@st.cache_data(ttl=30, max_entries=8, show_spinner=False)
+def _allocation_frame(geo_allocation):
+    """Build the allocation table; reruns with unchanged allocation hit the cache."""
+    return pd.DataFrame.from_records(geo_allocation, columns=tuple(_ALLOC_LABELS))
+
+def display_analytics_dashboard(portfolio_data):
     """Display real-time analytics dashboard."""
     st.subheader("📈 Real-Time Analytics")
     
     try:
-        # Get portfolio data
-        portfolio_data = get_portfolio_value()
-        
         if "error" in portfolio_data:
             st.error(f"Analytics unavailable: {portfolio_data['error']}")
             return
@@ -551,7 +681,7 @@ def display_analytics_dashboard():
         with col1:
             st.metric(
                 "Total Portfolio",
-                f"${portfolio_data.get('total_value', 0):,.0f}"
+                _fmt_usd(portfolio_data.get('total_value', 0))
             )
         
         with col2:
@@ -570,91 +700,101 @@ def display_analytics_dashboard():
         
         with col4:
             surprises = portfolio_data.get('earnings_surprises', [])
-            positive_surprises = sum(1 for s in surprises if s['surprise_percentage'] > 0)
+            # The beats count comes precomputed; the frame is reused for the table below
+            surprises_df = pd.DataFrame(surprises) if surprises else None
+            positive_surprises = portfolio_data.get('earnings_beats_count')
+            if positive_surprises is None:  # Snapshot cached before the count was added
+                positive_surprises = int((surprises_df['surprise_percentage'] > 0).sum()) if surprises_df is not None else 0
             st.metric(
                 "Earnings Beats",
                 f"{positive_surprises}/{len(surprises)}"
             )
         
-        # "View Full Portfolio" button
-        if st.button("🔍 View Full Portfolio", help="Click to see detailed breakdown of all positions"):
-            display_full_portfolio()
-        
         # Portfolio allocation breakdown
         if 'geo_allocation' in portfolio_data:
             st.write("**Portfolio Allocation:**")
-            allocation_df = pd.DataFrame(portfolio_data['geo_allocation'])
-            allocation_df['value'] = allocation_df['market_value'].apply(lambda x: f"${x:,.0f}")
-            allocation_df['percentage'] = allocation_df['percentage'].apply(lambda x: f"{x:.1f}%")
-            display_df = allocation_df[['geo_tag', 'value', 'percentage']].rename(columns={
-                'geo_tag': 'Region/Sector',
-                'value': 'Market Value',
-                'percentage': 'Allocation %'
-            })
-            st.dataframe(display_df, use_container_width=True)
+            allocation_df = _allocation_frame(portfolio_data['geo_allocation'])
+            st.dataframe(
+                allocation_df.style.format(_ALLOC_FMT),
+                use_container_width=True,
+                column_config=_ALLOC_LABELS
+            )
         
         # Earnings surprises
-        if surprises:
+        if surprises_df is not None:
             st.write("**Recent Earnings Surprises:**")
-            surprises_df = pd.DataFrame(surprises)
             st.dataframe(surprises_df, use_container_width=True)
             
     except Exception as e:
         st.error(f"Analytics error: {e}")
 
+def _load_portfolio_data():
+    """Fetch portfolio analytics, turning failures into an error payload."""
+    try:
+        return _cached_portfolio()
+    except Exception as e:
+        logger.error("Portfolio fetch error: %s", e)
+        return {"error": str(e)}
+
+def voice_query_page():
+    """Voice and text query page."""
+    # Input section
+    input_col1, input_col2 = st.columns([1, 1])
+    
+    query = None
+    
+    with input_col1:
+        if st.session_state.voice_enabled:
+            voice_query = process_voice_input()
+            if voice_query:
+                query = voice_query
+    
+    with input_col2:
+        text_query = process_text_input()
+        if text_query:
+            query = text_query
+    
+    # Process query if provided
+    if query:
+        if not st.session_state.gemini_api_key:
+            st.error("❌ Please provide Gemini API Key in the sidebar to process queries")
+        else:
+            with st.spinner("🧠 Processing your query..."):
+                try:
+                    response = _query_batcher().submit(query).result()
+                    display_response(query, response)
+                except Exception as e:
+                    st.error(f"Processing error: {e}")
+                    logger.error("Query processing error: %s", e)
+
+def analytics_page():
+    """Portfolio analytics page."""
+    display_analytics_dashboard(_load_portfolio_data())
+
+def portfolio_page():
+    """Full portfolio breakdown page."""
+    # The positions table is the heaviest view, so build it only on request
+    if st.toggle("🔍 View Full Portfolio", key="show_full", help="Show detailed breakdown of all positions"):
+        display_full_portfolio(_load_portfolio_data())
+
+def history_page():
+    """Chat history page."""
+    display_chat_history()
+
 def main():
     """Main application function."""
     initialize_session_state()
     display_header()
     display_sidebar()
     
-    # Main content area
-    main_tab1, main_tab2, main_tab3, main_tab4 = st.tabs([
-        "🎤 Voice Query", 
-        "📊 Analytics", 
-        "💼 Portfolio",
-        "💬 History"
+    # Main content area: only the selected page's code runs on each rerun
+    page = st.navigation([
+        st.Page(voice_query_page, title="Voice Query", icon="🎤", default=True),
+        st.Page(analytics_page, title="Analytics", icon="📊"),
+        st.Page(portfolio_page, title="Portfolio", icon="💼"),
+        st.Page(history_page, title="History", icon="💬"),
     ])
-    
-    with main_tab1:
-        # Input section
-        input_col1, input_col2 = st.columns([1, 1])
-        
-        query = None
-        
-        with input_col1:
-            if st.session_state.voice_enabled:
-                voice_query = process_voice_input()
-                if voice_query:
-                    query = voice_query
-        
-        with input_col2:
-            text_query = process_text_input()
-            if text_query:
-                query = text_query
-        
-        # Process query if provided
-        if query:
-            if not st.session_state.gemini_api_key:
-                st.error("❌ Please provide Gemini API Key in the sidebar to process queries")
-            else:
-                with st.spinner("🧠 Processing your query..."):
-                    try:
-                        response = process_finance_query(query)
-                        display_response(query, response)
-                    except Exception as e:
-                        st.error(f"Processing error: {e}")
-                        logger.error(f"Query processing error: {e}")
-    
-    with main_tab2:
-        display_analytics_dashboard()
-    
-    with main_tab3:
-        # Dedicated portfolio tab shows the full portfolio by default
-        display_full_portfolio()
-    
-    with main_tab4:
-        display_chat_history()
+    page.run()
     
     # Footer
     st.divider()
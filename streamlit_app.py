@@ -23,6 +23,8 @@ import yfinance as yf
 import requests
 import logging
 import re
+import time
+from collections import deque
 
 # Simple logging for cloud
 logging.basicConfig(level=logging.INFO)
@@ -30,123 +32,139 @@ logger = logging.getLogger(__name__)
 
 logger.info("🌟 AI Finance Studio - Cloud Production Version Starting")
 
-def get_time_based_greeting():
-    """Get time-based greeting using IST."""
+_IST = pytz.timezone('Asia/Kolkata')
+
+_CHAT_HISTORY_LIMIT = 5
+
+# Sentence boundaries used to synthesize speech in parallel chunks
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+@st.cache_resource(show_spinner=False)
+def _get_api_key() -> str:
+    """Resolve the Gemini API key from Streamlit secrets or environment once per process."""
     try:
-        ist = pytz.timezone('Asia/Kolkata')
-        current_time = datetime.now(ist)
-        hour = current_time.hour
-        
-        if 5 <= hour < 12:
-            return "Good morning"
-        elif 12 <= hour < 17:
-            return "Good afternoon"
-        else:
-            return "Good evening"
+        return st.secrets["GEMINI_API_KEY"]
     except Exception:
-        return "Hello"
+        return os.getenv("GEMINI_API_KEY", "")
+
+def get_time_based_greeting(now=None):
+    """Get time-based greeting using IST."""
+    hour = (now or datetime.now(_IST)).hour
+    if 5 <= hour < 12:
+        return "Good morning"
+    elif 12 <= hour < 17:
+        return "Good afternoon"
+    else:
+        return "Good evening"
+
+# Static demo portfolio, rebuilt once per script run; only the timestamps
+# are filled in per call
+_PORTFOLIO_TEMPLATE = {
+    "total_value": 242040,
+    "cost_basis": 235000,
+    "positions_count": 27,
+    "daily_change": 1250,
+    "daily_change_percent": 0.52,
+    "total_gain_loss": 7040,
+    "total_gain_loss_percent": 2.99,
+    "asia_tech_exposure": 16.8,
+    
+    # Complete 27-stock portfolio
+    "all_holdings": [
+        {"symbol": "AAPL", "name": "Apple Inc.", "value": 18000, "change": 2.1, "weight": 7.4, "sector": "US-Tech"},
+        {"symbol": "MSFT", "name": "Microsoft Corp.", "value": 15000, "change": 1.8, "weight": 6.2, "sector": "US-Tech"},
+        {"symbol": "NVDA", "name": "NVIDIA Corp.", "value": 12000, "change": 3.2, "weight": 5.0, "sector": "US-Tech"},
+        {"symbol": "GOOGL", "name": "Alphabet Inc.", "value": 14000, "change": 0.9, "weight": 5.8, "sector": "US-Tech"},
+        {"symbol": "TSLA", "name": "Tesla Inc.", "value": 10000, "change": -1.2, "weight": 4.1, "sector": "US-Tech"},
+        {"symbol": "AMZN", "name": "Amazon.com Inc.", "value": 9500, "change": 1.5, "weight": 3.9, "sector": "US-Tech"},
+        {"symbol": "META", "name": "Meta Platforms", "value": 8200, "change": 2.8, "weight": 3.4, "sector": "US-Tech"},
+        {"symbol": "NFLX", "name": "Netflix Inc.", "value": 6800, "change": -0.8, "weight": 2.8, "sector": "US-Tech"},
+        {"symbol": "CRM", "name": "Salesforce Inc.", "value": 5900, "change": 1.2, "weight": 2.4, "sector": "US-Tech"},
+        {"symbol": "ADBE", "name": "Adobe Inc.", "value": 5200, "change": 0.7, "weight": 2.1, "sector": "US-Tech"},
+        {"symbol": "ORCL", "name": "Oracle Corp.", "value": 4800, "change": 1.9, "weight": 2.0, "sector": "US-Tech"},
+        {"symbol": "INTC", "name": "Intel Corp.", "value": 4200, "change": -1.5, "weight": 1.7, "sector": "US-Tech"},
+        {"symbol": "AMD", "name": "Advanced Micro Devices", "value": 4000, "change": 2.3, "weight": 1.7, "sector": "US-Tech"},
+        
+        # Asia-Tech Holdings
+        {"symbol": "TSM", "name": "Taiwan Semiconductor", "value": 8500, "change": -0.5, "weight": 3.5, "sector": "Asia-Tech"},
+        {"symbol": "BABA", "name": "Alibaba Group", "value": 7200, "change": -1.8, "weight": 3.0, "sector": "Asia-Tech"},
+        {"symbol": "TCEHY", "name": "Tencent Holdings", "value": 6800, "change": -0.9, "weight": 2.8, "sector": "Asia-Tech"},
+        {"symbol": "ASML", "name": "ASML Holding", "value": 5600, "change": 1.1, "weight": 2.3, "sector": "Asia-Tech"},
+        {"symbol": "TCS.NS", "name": "Tata Consultancy Services", "value": 4200, "change": 0.8, "weight": 1.7, "sector": "Asia-Tech"},
+        {"symbol": "INFOSYS.NS", "name": "Infosys Limited", "value": 3800, "change": 1.2, "weight": 1.6, "sector": "Asia-Tech"},
+        {"symbol": "HDB", "name": "HDFC Bank", "value": 3200, "change": 0.5, "weight": 1.3, "sector": "Asia-Tech"},
+        {"symbol": "WIT", "name": "Wipro Limited", "value": 1365, "change": -0.3, "weight": 0.6, "sector": "Asia-Tech"},
+        
+        # European Holdings  
+        {"symbol": "SAP", "name": "SAP SE", "value": 12000, "change": 0.8, "weight": 5.0, "sector": "Europe"},
+        {"symbol": "ASML", "name": "ASML Holding", "value": 10500, "change": 1.1, "weight": 4.3, "sector": "Europe"},
+        {"symbol": "NESN.SW", "name": "Nestle SA", "value": 8900, "change": 0.3, "weight": 3.7, "sector": "Europe"},
+        {"symbol": "NOVN.SW", "name": "Novartis AG", "value": 7200, "change": -0.2, "weight": 3.0, "sector": "Europe"},
+        {"symbol": "UL", "name": "Unilever PLC", "value": 6800, "change": 0.4, "weight": 2.8, "sector": "Europe"},
+        {"symbol": "MC.PA", "name": "LVMH", "value": 2908, "change": 1.2, "weight": 1.2, "sector": "Europe"},
+        
+        # Other/Emerging Markets
+        {"symbol": "V", "name": "Visa Inc.", "value": 15000, "change": 1.6, "weight": 6.2, "sector": "Other"},
+        {"symbol": "JNJ", "name": "Johnson & Johnson", "value": 8500, "change": 0.9, "weight": 3.5, "sector": "Other"},
+        {"symbol": "PG", "name": "Procter & Gamble", "value": 4469, "change": 0.2, "weight": 1.8, "sector": "Other"}
+    ],
+    
+    "top_holdings": [
+        {"symbol": "AAPL", "name": "Apple Inc.", "value": 18000, "change": 2.1, "weight": 7.4},
+        {"symbol": "V", "name": "Visa Inc.", "value": 15000, "change": 1.6, "weight": 6.2},
+        {"symbol": "MSFT", "name": "Microsoft Corp.", "value": 15000, "change": 1.8, "weight": 6.2},
+        {"symbol": "GOOGL", "name": "Alphabet Inc.", "value": 14000, "change": 0.9, "weight": 5.8},
+        {"symbol": "SAP", "name": "SAP SE", "value": 12000, "change": 0.8, "weight": 5.0},
+        {"symbol": "NVDA", "name": "NVIDIA Corp.", "value": 12000, "change": 3.2, "weight": 5.0},
+        {"symbol": "ASML", "name": "ASML Holding", "value": 10500, "change": 1.1, "weight": 4.3},
+        {"symbol": "TSLA", "name": "Tesla Inc.", "value": 10000, "change": -1.2, "weight": 4.1}
+    ],
+    
+    "regions": [
+        {"name": "US-Tech", "value": 125000, "percentage": 51.6, "change": 0.8},
+        {"name": "Asia-Tech", "value": 40663, "percentage": 16.8, "change": -0.3},
+        {"name": "Europe", "value": 48408, "percentage": 20.0, "change": 0.4},
+        {"name": "Other", "value": 27969, "percentage": 11.6, "change": 0.1}
+    ],
+    
+    "performance_metrics": {
+        "sharpe_ratio": 1.85,
+        "max_drawdown": -8.2,
+        "ytd_return": 12.4,
+        "volatility": 15.8,
+        "beta": 1.12,
+        "alpha": 2.8
+    }
+}
 
 def get_portfolio_data():
     """Get comprehensive 27-stock portfolio data."""
-    current_time = datetime.now(pytz.timezone('Asia/Kolkata'))
+    current_time = datetime.now(_IST)
     
-    return {
-        "total_value": 242040,
-        "cost_basis": 235000,
-        "positions_count": 27,
-        "daily_change": 1250,
-        "daily_change_percent": 0.52,
-        "total_gain_loss": 7040,
-        "total_gain_loss_percent": 2.99,
-        "date": current_time.strftime("%Y-%m-%d"),
-        "last_updated": current_time.strftime("%H:%M:%S IST"),
-        "asia_tech_exposure": 16.8,
-        
-        # Complete 27-stock portfolio
-        "all_holdings": [
-            {"symbol": "AAPL", "name": "Apple Inc.", "value": 18000, "change": 2.1, "weight": 7.4, "sector": "US-Tech"},
-            {"symbol": "MSFT", "name": "Microsoft Corp.", "value": 15000, "change": 1.8, "weight": 6.2, "sector": "US-Tech"},
-            {"symbol": "NVDA", "name": "NVIDIA Corp.", "value": 12000, "change": 3.2, "weight": 5.0, "sector": "US-Tech"},
-            {"symbol": "GOOGL", "name": "Alphabet Inc.", "value": 14000, "change": 0.9, "weight": 5.8, "sector": "US-Tech"},
-            {"symbol": "TSLA", "name": "Tesla Inc.", "value": 10000, "change": -1.2, "weight": 4.1, "sector": "US-Tech"},
-            {"symbol": "AMZN", "name": "Amazon.com Inc.", "value": 9500, "change": 1.5, "weight": 3.9, "sector": "US-Tech"},
-            {"symbol": "META", "name": "Meta Platforms", "value": 8200, "change": 2.8, "weight": 3.4, "sector": "US-Tech"},
-            {"symbol": "NFLX", "name": "Netflix Inc.", "value": 6800, "change": -0.8, "weight": 2.8, "sector": "US-Tech"},
-            {"symbol": "CRM", "name": "Salesforce Inc.", "value": 5900, "change": 1.2, "weight": 2.4, "sector": "US-Tech"},
-            {"symbol": "ADBE", "name": "Adobe Inc.", "value": 5200, "change": 0.7, "weight": 2.1, "sector": "US-Tech"},
-            {"symbol": "ORCL", "name": "Oracle Corp.", "value": 4800, "change": 1.9, "weight": 2.0, "sector": "US-Tech"},
-            {"symbol": "INTC", "name": "Intel Corp.", "value": 4200, "change": -1.5, "weight": 1.7, "sector": "US-Tech"},
-            {"symbol": "AMD", "name": "Advanced Micro Devices", "value": 4000, "change": 2.3, "weight": 1.7, "sector": "US-Tech"},
-            
-            # Asia-Tech Holdings
-            {"symbol": "TSM", "name": "Taiwan Semiconductor", "value": 8500, "change": -0.5, "weight": 3.5, "sector": "Asia-Tech"},
-            {"symbol": "BABA", "name": "Alibaba Group", "value": 7200, "change": -1.8, "weight": 3.0, "sector": "Asia-Tech"},
-            {"symbol": "TCEHY", "name": "Tencent Holdings", "value": 6800, "change": -0.9, "weight": 2.8, "sector": "Asia-Tech"},
-            {"symbol": "ASML", "name": "ASML Holding", "value": 5600, "change": 1.1, "weight": 2.3, "sector": "Asia-Tech"},
-            {"symbol": "TCS.NS", "name": "Tata Consultancy Services", "value": 4200, "change": 0.8, "weight": 1.7, "sector": "Asia-Tech"},
-            {"symbol": "INFOSYS.NS", "name": "Infosys Limited", "value": 3800, "change": 1.2, "weight": 1.6, "sector": "Asia-Tech"},
-            {"symbol": "HDB", "name": "HDFC Bank", "value": 3200, "change": 0.5, "weight": 1.3, "sector": "Asia-Tech"},
-            {"symbol": "WIT", "name": "Wipro Limited", "value": 1365, "change": -0.3, "weight": 0.6, "sector": "Asia-Tech"},
-            
-            # European Holdings  
-            {"symbol": "SAP", "name": "SAP SE", "value": 12000, "change": 0.8, "weight": 5.0, "sector": "Europe"},
-            {"symbol": "ASML", "name": "ASML Holding", "value": 10500, "change": 1.1, "weight": 4.3, "sector": "Europe"},
-            {"symbol": "NESN.SW", "name": "Nestle SA", "value": 8900, "change": 0.3, "weight": 3.7, "sector": "Europe"},
-            {"symbol": "NOVN.SW", "name": "Novartis AG", "value": 7200, "change": -0.2, "weight": 3.0, "sector": "Europe"},
-            {"symbol": "UL", "name": "Unilever PLC", "value": 6800, "change": 0.4, "weight": 2.8, "sector": "Europe"},
-            {"symbol": "MC.PA", "name": "LVMH", "value": 2908, "change": 1.2, "weight": 1.2, "sector": "Europe"},
-            
-            # Other/Emerging Markets
-            {"symbol": "V", "name": "Visa Inc.", "value": 15000, "change": 1.6, "weight": 6.2, "sector": "Other"},
-            {"symbol": "JNJ", "name": "Johnson & Johnson", "value": 8500, "change": 0.9, "weight": 3.5, "sector": "Other"},
-            {"symbol": "PG", "name": "Procter & Gamble", "value": 4469, "change": 0.2, "weight": 1.8, "sector": "Other"}
-        ],
-        
-        "top_holdings": [
-            {"symbol": "AAPL", "name": "Apple Inc.", "value": 18000, "change": 2.1, "weight": 7.4},
-            {"symbol": "V", "name": "Visa Inc.", "value": 15000, "change": 1.6, "weight": 6.2},
-            {"symbol": "MSFT", "name": "Microsoft Corp.", "value": 15000, "change": 1.8, "weight": 6.2},
-            {"symbol": "GOOGL", "name": "Alphabet Inc.", "value": 14000, "change": 0.9, "weight": 5.8},
-            {"symbol": "SAP", "name": "SAP SE", "value": 12000, "change": 0.8, "weight": 5.0},
-            {"symbol": "NVDA", "name": "NVIDIA Corp.", "value": 12000, "change": 3.2, "weight": 5.0},
-            {"symbol": "ASML", "name": "ASML Holding", "value": 10500, "change": 1.1, "weight": 4.3},
-            {"symbol": "TSLA", "name": "Tesla Inc.", "value": 10000, "change": -1.2, "weight": 4.1}
-        ],
-        
-        "regions": [
-            {"name": "US-Tech", "value": 125000, "percentage": 51.6, "change": 0.8},
-            {"name": "Asia-Tech", "value": 40663, "percentage": 16.8, "change": -0.3},
-            {"name": "Europe", "value": 48408, "percentage": 20.0, "change": 0.4},
-            {"name": "Other", "value": 27969, "percentage": 11.6, "change": 0.1}
-        ],
-        
-        "performance_metrics": {
-            "sharpe_ratio": 1.85,
-            "max_drawdown": -8.2,
-            "ytd_return": 12.4,
-            "volatility": 15.8,
-            "beta": 1.12,
-            "alpha": 2.8
-        }
-    }
+    portfolio = _PORTFOLIO_TEMPLATE.copy()
+    portfolio["date"] = current_time.strftime("%Y-%m-%d")
+    portfolio["last_updated"] = current_time.strftime("%H:%M:%S IST")
+    return portfolio
+
+@st.cache_resource(show_spinner=False)
+def _gemini_model(api_key):
+    """Configure Gemini and build the model once per process and key."""
+    import google.generativeai as genai
+    
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel('gemini-1.5-flash')
 
-def ai_query_processor(query):
-    """Process queries with Gemini AI - cloud optimized with full portfolio context."""
+def stream_query_response(query):
+    """Stream Gemini's answer chunk by chunk - cloud optimized with full portfolio context."""
     try:
-        import google.generativeai as genai
-        
         # Get API key from secrets or environment
-        api_key = ""
-        try:
-            api_key = st.secrets["GEMINI_API_KEY"]
-        except:
-            api_key = os.getenv("GEMINI_API_KEY", "")
+        api_key = _get_api_key()
         
         if not api_key:
-            return "🔑 Please configure your Gemini API key in Streamlit secrets to enable AI analysis."
+            yield "🔑 Please configure your Gemini API key in Streamlit secrets to enable AI analysis."
+            return
         
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        model = _gemini_model(api_key)
         
         portfolio = get_portfolio_data()
         greeting = get_time_based_greeting()
@@ -200,17 +218,20 @@ As a professional financial advisor, provide a comprehensive response that:
 
 Focus on being data-driven and specific rather than generic advice."""
         
-        response = model.generate_content(prompt)
-        return response.text
+        for chunk in model.generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+                # Release the GIL between chunks so the server thread can flush updates
+                time.sleep(0)
         
     except Exception as e:
-        logger.error(f"AI processing error: {e}")
-        return f"🚫 AI analysis temporarily unavailable. Please try again or contact support. Error: {str(e)}"
+        logger.error("AI processing error: %s", e)
+        yield f"🚫 AI analysis temporarily unavailable. Please try again or contact support. Error: {str(e)}"
 
-def create_welcome_message():
+def create_welcome_message(now=None):
     """Create comprehensive welcome message."""
+    greeting = get_time_based_greeting(now)
     try:
-        greeting = get_time_based_greeting()
         portfolio = get_portfolio_data()
         
         total_value = portfolio['total_value']
@@ -236,8 +257,8 @@ Ready for portfolio analysis and market insights!"""
         return welcome_msg
         
     except Exception as e:
-        logger.error(f"Welcome message error: {e}")
-        return f"{get_time_based_greeting()}! Welcome to AI Finance Studio! Ready for financial analysis."
+        logger.error("Welcome message error: %s", e)
+        return f"{greeting}! Welcome to AI Finance Studio! Ready for financial analysis."
 
 def create_portfolio_charts():
     """Create portfolio visualization charts."""
@@ -283,20 +304,60 @@ def create_portfolio_charts():
         return fig_pie, fig_bar
         
     except Exception as e:
-        logger.error(f"Chart creation error: {e}")
+        logger.error("Chart creation error: %s", e)
         return None, None
 
+# Dropdown options with category separators
+_QUERY_OPTIONS = (
+    "Select a query...",
+    "--- 📊 Performance Analysis ---",
+    "What's my portfolio performance today?",
+    "Show me my total gains and losses",
+    "How is my portfolio performing this week?",
+    "What's my best performing stock today?",
+    "Which stocks are underperforming?",
+    "Summarize today's portfolio performance",
+    "--- 🌏 Regional & Sector Analysis ---",
+    "Show me Asia tech exposure analysis",
+    "What's happening in Asian markets?",
+    "Which region has the highest allocation?",
+    "Analyze my sector diversification",
+    "Compare US vs International holdings",
+    "--- 📈 Individual Stock Analysis ---",
+    "Tell me about my top performing stock",
+    "Which stock should I watch closely?",
+    "Analyze my technology stocks",
+    "Show me dividend-paying stocks in my portfolio",
+    "What are my riskiest positions?",
+    "--- ⚠️ Risk & Strategy ---",
+    "What's my risk exposure analysis?",
+    "Should I rebalance my portfolio?",
+    "Identify potential selling opportunities",
+    "Show me correlation risks",
+    "Analyze my portfolio volatility",
+    "--- 📰 Market Insights ---",
+    "Any earnings surprises today?",
+    "What's the market sentiment?",
+    "Show me economic calendar events",
+    "Analyze current market trends",
+    "What's driving market movements today?"
+)
+
 def initialize_session_state():
     """Initialize session state variables."""
     if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+        # Only the latest conversations are shown, so older ones fall off the end
+        st.session_state.chat_history = deque(maxlen=_CHAT_HISTORY_LIMIT)
+
+@st.fragment(run_every="1s")
+def display_clock():
+    """Display the IST clock; as a fragment it ticks without rerunning the app."""
+    time_str = datetime.now(_IST).strftime("%Y-%m-%d %H:%M:%S IST")
+    st.markdown(f"**🕐 Current Time**")
+    st.markdown(f"`{time_str}`")
 
 def display_header():
     """Display application header with IST time."""
-    ist = pytz.timezone('Asia/Kolkata')
-    current_time = datetime.now(ist)
-    time_str = current_time.strftime("%Y-%m-%d %H:%M:%S IST")
-    
     col1, col2 = st.columns([3, 1])
     
     with col1:
@@ -304,12 +365,33 @@ def display_header():
         st.markdown("**Real-Time Portfolio Analytics & Market Insights**")
     
     with col2:
-        st.markdown(f"**🕐 Current Time**")
-        st.markdown(f"`{time_str}`")
+        display_clock()
 
-def display_welcome():
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def synthesize_speech(text, voice="en-US-AriaNeural"):
+    """Synthesize MP3 audio with Edge TTS, cached by text and voice."""
+    import edge_tts
+    import asyncio
+    
+    async def synthesize(sentence):
+        communicate = edge_tts.Communicate(sentence, voice)
+        # Collect the MP3 in memory instead of round-tripping a temp file
+        audio = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio.extend(chunk["data"])
+        return bytes(audio)
+    
+    async def generate_speech():
+        # Synthesize sentences concurrently; MP3 frames concatenate in order
+        sentences = _SENTENCE_SPLIT.split(text)
+        return b"".join(await asyncio.gather(*(synthesize(s) for s in sentences)))
+    
+    return asyncio.run(generate_speech())
+
+def display_welcome(now):
     """Display welcome section."""
-    welcome_text = create_welcome_message()
+    welcome_text = create_welcome_message(now)
     st.success(f"🎉 {welcome_text}")
     
     col1, col2 = st.columns(2)
@@ -344,29 +426,13 @@ def display_welcome():
     with col2:
         if st.button("🔊 Speak Welcome Briefing", type="secondary"):
             try:
-                import edge_tts
-                import asyncio
-                import tempfile
-                import base64
-                
                 # Clean welcome message for voice
                 clean_message = clean_text_for_voice(welcome_text)
                 
-                async def generate_speech():
-                    voice = "en-US-AriaNeural"  # Female voice
-                    communicate = edge_tts.Communicate(clean_message, voice)
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
-                        async for chunk in communicate.stream():
-                            if chunk["type"] == "audio":
-                                tmp_file.write(chunk["data"])
-                        return tmp_file.name
-                
                 # Generate audio
-                audio_file = asyncio.run(generate_speech())
+                audio_data = synthesize_speech(clean_message)
                 
-                if audio_file:
-                    with open(audio_file, "rb") as f:
-                        audio_data = f.read()
+                if audio_data:
                     st.audio(audio_data, format="audio/mp3")
                     st.success("✅ Audio generated successfully!")
                 else:
@@ -475,82 +541,57 @@ def clean_text_for_voice(text):
     
     return clean_text
 
+@st.fragment(run_every=1)
+def display_footer():
+    """Display the footer; as a fragment it ticks on its own without rerunning the app."""
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown(f"🕐 Last Updated: {datetime.now(_IST).strftime('%H:%M:%S IST')}")
+    with col2:
+        st.markdown("☁️ Streamlit Cloud Production")
+    with col3:
+        st.markdown("🤖 Powered by Gemini AI")
+
 def main():
     """Main application function."""
     initialize_session_state()
+    
+    # Resolve IST once per rerun for the greeting; the header clock ticks on its own
+    now = datetime.now(_IST)
     display_header()
     display_sidebar()
     
     # Welcome section
-    display_welcome()
+    display_welcome(now)
     
     st.markdown("---")
     
-    # Main interaction tabs
-    tab1, tab2, tab3 = st.tabs(["💬 Chat Query", "📊 Analytics", "📈 Portfolio"])
+    # Main interaction views; unlike st.tabs, only the selected view's body runs
+    view = st.radio(
+        "View",
+        ("💬 Chat Query", "📊 Analytics", "📈 Portfolio"),
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed"
+    )
     
-    with tab1:
+    if view == "💬 Chat Query":
         st.subheader("💬 Ask Your Financial Questions")
         
         # Quick Portfolio Queries Dropdown - much cleaner interface
         st.markdown("### 🚀 Quick Portfolio Queries")
         st.markdown("*Select a pre-built query for instant analysis:*")
         
-        # Organize all queries into a single dropdown
-        quick_queries = {
-            "📊 Performance Analysis": [
-                "What's my portfolio performance today?",
-                "Show me my total gains and losses",
-                "How is my portfolio performing this week?",
-                "What's my best performing stock today?",
-                "Which stocks are underperforming?",
-                "Summarize today's portfolio performance"
-            ],
-            "🌏 Regional & Sector Analysis": [
-                "Show me Asia tech exposure analysis",
-                "What's happening in Asian markets?",
-                "Which region has the highest allocation?",
-                "Analyze my sector diversification",
-                "Compare US vs International holdings"
-            ],
-            "📈 Individual Stock Analysis": [
-                "Tell me about my top performing stock",
-                "Which stock should I watch closely?",
-                "Analyze my technology stocks",
-                "Show me dividend-paying stocks in my portfolio",
-                "What are my riskiest positions?"
-            ],
-            "⚠️ Risk & Strategy": [
-                "What's my risk exposure analysis?",
-                "Should I rebalance my portfolio?",
-                "Identify potential selling opportunities",
-                "Show me correlation risks",
-                "Analyze my portfolio volatility"
-            ],
-            "📰 Market Insights": [
-                "Any earnings surprises today?",
-                "What's the market sentiment?",
-                "Show me economic calendar events",
-                "Analyze current market trends",
-                "What's driving market movements today?"
-            ]
-        }
-        
-        # Create flattened list for dropdown
-        all_queries = []
-        for category, queries in quick_queries.items():
-            all_queries.append(f"--- {category} ---")
-            all_queries.extend(queries)
-        
         # Dropdown selection
         selected_query = st.selectbox(
             "Choose a quick query:",
-            ["Select a query..."] + all_queries,
+            _QUERY_OPTIONS,
             index=0
         )
         
         # Handle dropdown selection
-        if selected_query and selected_query != "Select a query..." and not selected_query.startswith("---"):
+        if selected_query and selected_query != _QUERY_OPTIONS[0] and not selected_query.startswith("---"):
             if st.button("🚀 Execute Query", type="primary"):
                 st.session_state.quick_query = selected_query
         
@@ -573,35 +614,29 @@ def main():
             st.info(f"🚀 Executing selected query: {query_to_process}")
             del st.session_state.quick_query
             # Auto-process dropdown queries
-            with st.spinner("🧠 Processing your query..."):
-                response = ai_query_processor(query_to_process)
-                
-                # Display response
-                st.markdown("### 🤖 AI Response")
-                st.markdown(response)
-                
-                # Add to chat history
-                st.session_state.chat_history.append({
-                    "query": query_to_process,
-                    "response": response,
-                    "timestamp": datetime.now().strftime("%H:%M:%S")
-                })
+            # Stream the response as it arrives
+            st.markdown("### 🤖 AI Response")
+            response = st.write_stream(stream_query_response(query_to_process))
+            
+            # Add to chat history
+            st.session_state.chat_history.append({
+                "query": query_to_process,
+                "response": response,
+                "timestamp": time.time()
+            })
         
         # Handle manual text input
         elif st.button("🔍 Analyze", type="primary") and user_query:
-            with st.spinner("🧠 Processing your query..."):
-                response = ai_query_processor(user_query)
-                
-                # Display response
-                st.markdown("### 🤖 AI Response")
-                st.markdown(response)
-                
-                # Add to chat history
-                st.session_state.chat_history.append({
-                    "query": user_query,
-                    "response": response,
-                    "timestamp": datetime.now().strftime("%H:%M:%S")
-                })
+            # Stream the response as it arrives
+            st.markdown("### 🤖 AI Response")
+            response = st.write_stream(stream_query_response(user_query))
+            
+            # Add to chat history
+            st.session_state.chat_history.append({
+                "query": user_query,
+                "response": response,
+                "timestamp": time.time()
+            })
         
         # Show helpful message when no query
         elif not query_to_process and not user_query:
@@ -610,12 +645,13 @@ def main():
         # Chat history
         if st.session_state.chat_history:
             st.markdown("### 📝 Recent Conversations")
-            for i, chat in enumerate(reversed(st.session_state.chat_history[-5:])):
-                with st.expander(f"💬 {chat['timestamp']}: {chat['query'][:50]}..."):
+            for i, chat in enumerate(reversed(st.session_state.chat_history)):
+                asked_at = datetime.fromtimestamp(chat['timestamp']).strftime("%H:%M:%S")
+                with st.expander(f"💬 {asked_at}: {chat['query'][:50]}..."):
                     st.markdown(f"**Question:** {chat['query']}")
                     st.markdown(f"**Answer:** {chat['response']}")
     
-    with tab2:
+    elif view == "📊 Analytics":
         st.subheader("📊 Portfolio Analytics Dashboard")
         
         portfolio = get_portfolio_data()
@@ -657,7 +693,7 @@ def main():
         
         st.dataframe(display_df, use_container_width=True)
     
-    with tab3:
+    elif view == "📈 Portfolio":
         st.subheader("📈 Portfolio Holdings")
         
         portfolio = get_portfolio_data()
@@ -790,14 +826,7 @@ def main():
 
     # Footer
     st.markdown("---")
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown(f"🕐 Last Updated: {portfolio['last_updated']}")
-    with col2:
-        st.markdown("☁️ Streamlit Cloud Production")
-    with col3:
-        st.markdown("🤖 Powered by Gemini AI")
+    display_footer()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
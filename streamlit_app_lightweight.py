@@ -49,6 +49,24 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Predefined queries (blank first entry means "none selected") and tips
+QUERY_OPTIONS = (
+    "",
+    "What's my portfolio performance summary?",
+    "Which stocks should I consider selling?",
+    "What's my risk exposure?",
+    "How diversified is my portfolio?",
+    "Which sectors am I overweight in?"
+)
+
+TIPS = (
+    "💼 Diversify across sectors and geographies",
+    "📊 Review your portfolio monthly",
+    "🎯 Set clear investment goals",
+    "⚖️ Balance risk and reward",
+    "📚 Stay informed about market trends"
+)
+
 def load_sample_portfolio():
     """Load sample portfolio data"""
     return {
@@ -60,8 +78,9 @@ def load_sample_portfolio():
         'TCS.NS': {'shares': 50, 'avg_cost': 3200.00}
     }
 
+@st.cache_data(ttl=60, show_spinner=False)
 def get_stock_data(symbol):
-    """Get current stock data"""
+    """Get current stock data (cached for a minute; "Refresh Data" clears it)"""
     try:
         stock = yf.Ticker(symbol)
         info = stock.info
@@ -203,15 +222,18 @@ def main():
             
             # Portfolio table
             st.subheader("📈 Holdings")
-            formatted_df = df.copy()
-            formatted_df['Current Value'] = formatted_df['Current Value'].apply(lambda x: f"${x:,.2f}")
-            formatted_df['Cost Basis'] = formatted_df['Cost Basis'].apply(lambda x: f"${x:,.2f}")
-            formatted_df['P&L'] = formatted_df['P&L'].apply(lambda x: f"${x:,.2f}")
-            formatted_df['P&L %'] = formatted_df['P&L %'].apply(lambda x: f"{x:.2f}%")
-            formatted_df['Current Price'] = formatted_df['Current Price'].apply(lambda x: f"${x:.2f}")
-            formatted_df['Avg Cost'] = formatted_df['Avg Cost'].apply(lambda x: f"${x:.2f}")
-            
-            st.dataframe(formatted_df, use_container_width=True)
+            # Format at render time; the columns stay numeric and sortable
+            st.dataframe(
+                df.style.format({
+                    'Current Value': "${:,.2f}",
+                    'Cost Basis': "${:,.2f}",
+                    'P&L': "${:,.2f}",
+                    'P&L %': "{:.2f}%",
+                    'Current Price': "${:.2f}",
+                    'Avg Cost': "${:.2f}"
+                }),
+                use_container_width=True
+            )
             
             # Charts
             st.subheader("📊 Portfolio Analysis")
@@ -236,15 +258,7 @@ def main():
         st.subheader("🤖 AI Assistant")
         
         # Predefined queries
-        query_options = [
-            "What's my portfolio performance summary?",
-            "Which stocks should I consider selling?",
-            "What's my risk exposure?",
-            "How diversified is my portfolio?",
-            "Which sectors am I overweight in?"
-        ]
-        
-        selected_query = st.selectbox("Quick Questions:", [""] + query_options)
+        selected_query = st.selectbox("Quick Questions:", QUERY_OPTIONS)
         custom_query = st.text_area("Or ask your own question:")
         
         query = selected_query if selected_query else custom_query
@@ -264,15 +278,7 @@ def main():
         
         # Tips
         st.subheader("💡 Quick Tips")
-        tips = [
-            "💼 Diversify across sectors and geographies",
-            "📊 Review your portfolio monthly",
-            "🎯 Set clear investment goals",
-            "⚖️ Balance risk and reward",
-            "📚 Stay informed about market trends"
-        ]
-        
-        for tip in tips:
+        for tip in TIPS:
             st.write(tip)
 
 if __name__ == "__main__":
@@ -108,6 +108,7 @@ class TestPortfolioAnalytics:
         assert surprises["TSM"] == 4.2
         assert "BABA" in surprises
         assert surprises["BABA"] == -2.1
+        assert result["earnings_beats_count"] == 1
         
         # Verify cache was created
         assert os.path.exists(analytics.cache_file)